@@ -1,6 +1,6 @@
 import pandas as pd
 import plotly.express as px
-from dash import Dash, dcc, html, Input, Output, callback_context, no_update
+from dash import Dash, dcc, html, Input, Output, State, ClientsideFunction
 import dash
 import os
 from datetime import datetime
@@ -35,6 +35,12 @@ df['year'] = df['date'].dt.year.astype(str)
 unique_years = df['year'].unique()
 color_map = {year: random_dark_color() for year in unique_years}
 
+# Set SHOW_CALLBACK_STATS=1 to show the graph callback counters under the sliders
+SHOW_CALLBACK_STATS = os.environ.get('SHOW_CALLBACK_STATS') == '1'
+
+# update_graph calls handled by this process, reported to the page when the counters are shown
+update_graph_calls = 0
+
 COLOR_SCALES = [
     'Viridis', 'Cividis', 'Plasma', 'Magma', 'Inferno',
     'Turbo', 'Blues', 'Greens', 'Reds', 'Purples', 'Jet'
@@ -89,10 +95,17 @@ app.layout = html.Div(className="container", children=[
                     value=1,
                     marks={1: '1', 7: '7', 14: '14', 30: '30'},
                     tooltip={"placement": "bottom", "always_visible": False},
-                    updatemode='drag'
                 ),
                 style={"width": "100%"} 
             ),
+
+            *([html.Div(id='callback-stats', style={"marginTop": "10px", "fontSize": "12px", "color": "#aaa"})]
+              if SHOW_CALLBACK_STATS else []),
+
+            # Graph requests are coalesced client-side (assets/coalesce.js) before reaching the server
+            dcc.Store(id='slider-dates', data=[date.isoformat() for date in unique_dates]),
+            dcc.Store(id='graph-request'),
+            dcc.Store(id='graph-response'),
         ]),
 
         
@@ -240,8 +253,12 @@ def aggregate_data(df, granularity):
     return resampled
 
 
-@app.callback(
-    Output('btc-dominance-graph', 'figure'),
+# Every control change goes through one client-side coalescer (assets/coalesce.js),
+# which debounces drags, drops duplicate intents and writes a sequenced request
+# to 'graph-request'. Only that store triggers a server render.
+app.clientside_callback(
+    ClientsideFunction(namespace='coalesce', function_name='coalesceRequest'),
+    Output('graph-request', 'data'),
     Input('date-range', 'start_date'),
     Input('date-range', 'end_date'),
     Input('date-slider', 'value'),
@@ -249,20 +266,58 @@ def aggregate_data(df, granularity):
     Input('color-scale', 'value'),
     Input('granularity', 'value'),
     Input('rolling-window', 'value'),
+    Input('rolling-window', 'drag_value'),
+    State('slider-dates', 'data'),
 )
-def update_graph(start_date, end_date, slider_range, graph_type, color_scale, granularity, rolling_window):
-    ctx = callback_context
-    triggered_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
-
-   
-    if triggered_id == 'date-slider' and slider_range:
-        start_date = index_to_date[slider_range[0]]
-        end_date = index_to_date[slider_range[1]]
-    else:
-        if isinstance(start_date, str):
-            start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-        if isinstance(end_date, str):
-            end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+
+# Keep the date picker in sync with the slider without a server round trip
+app.clientside_callback(
+    ClientsideFunction(namespace='coalesce', function_name='syncDateRange'),
+    Output('date-range', 'start_date'),
+    Output('date-range', 'end_date'),
+    Input('date-slider', 'value'),
+    State('slider-dates', 'data'),
+    prevent_initial_call=True
+)
+
+# Drop responses that were overtaken by a newer request
+app.clientside_callback(
+    ClientsideFunction(namespace='coalesce', function_name='applyResponse'),
+    Output('btc-dominance-graph', 'figure'),
+    Input('graph-response', 'data'),
+)
+
+
+@app.callback(
+    Output('graph-response', 'data'),
+    Input('graph-request', 'data'),
+)
+def update_graph(request):
+    if not request:
+        raise dash.exceptions.PreventUpdate
+
+    global update_graph_calls
+    update_graph_calls += 1
+
+    fig = build_figure(
+        request['start_date'],
+        request['end_date'],
+        request['graph_type'],
+        request['color_scale'],
+        request['granularity'],
+        request['rolling_window'],
+    )
+    response = {'seq': request['seq'], 'figure': fig.to_plotly_json()}
+    if SHOW_CALLBACK_STATS:
+        response['server_renders'] = update_graph_calls
+    return response
+
+
+def build_figure(start_date, end_date, graph_type, color_scale, granularity, rolling_window):
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
 
     mask = (df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)
     filtered = df.loc[mask].copy()
@@ -330,8 +385,6 @@ def update_graph(start_date, end_date, slider_range, graph_type, color_scale, gr
 
 @app.callback(
     [
-        Output('date-range', 'start_date'),
-        Output('date-range', 'end_date'),
         Output('date-slider', 'value'),
         Output('graph-type', 'value'),
         Output('color-scale', 'value'),
@@ -339,56 +392,22 @@ def update_graph(start_date, end_date, slider_range, graph_type, color_scale, gr
         Output('rolling-window', 'value'),
     ],
     [
-        Input('date-slider', 'value'),
         Input('reset-filters-btn', 'n_clicks'),
     ],
     prevent_initial_call=True
 )
-def update_filters(slider_range, reset_n_clicks):
-    ctx = callback_context
-    if not ctx.triggered:
+def update_filters(reset_n_clicks):
+    if not reset_n_clicks:
         raise dash.exceptions.PreventUpdate
 
-    triggered_id = ctx.triggered[0]['prop_id'].split('.')[0]
-
-    initial_start_date = unique_dates[0]
-    initial_end_date = unique_dates[-1]
-    slider_default = [0, len(unique_dates) - 1]
-    graph_type_default = 'line'
-    color_scale_default = 'Viridis'
-    granularity_default = 'day'
-    rolling_window_default = 1
-
-    if triggered_id == 'reset-filters-btn':
-        # Reset all controls to defaults
-        return (
-            initial_start_date,
-            initial_end_date,
-            slider_default,
-            graph_type_default,
-            color_scale_default,
-            granularity_default,
-            rolling_window_default,
-        )
-    elif triggered_id == 'date-slider':
-        
-        if slider_range is None or len(slider_range) != 2:
-            raise dash.exceptions.PreventUpdate
-
-        start_date = index_to_date[slider_range[0]]
-        end_date = index_to_date[slider_range[1]]
-
-        return (
-            start_date,
-            end_date,
-            no_update,  
-            no_update,  
-            no_update,  
-            no_update,  
-            no_update,  
-        )
-    else:
-        raise dash.exceptions.PreventUpdate
+    # Reset all controls to defaults; the date picker follows the slider client-side
+    return (
+        [0, len(unique_dates) - 1],
+        'line',
+        'Viridis',
+        'day',
+        1,
+    )
 
 
 # Fetch Data button callback: runs fetch and process pipeline, reloads data, updates button text
@@ -420,9 +439,9 @@ def on_fetch_data_click(n_clicks):
 @app.callback(
     Output("download-csv", "data"),
     Input("export-csv-btn", "n_clicks"),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('granularity', 'value')],
+    [State('date-range', 'start_date'),
+     State('date-range', 'end_date'),
+     State('granularity', 'value')],
     prevent_initial_call=True,
 )
 def export_filtered_data(n_clicks, start_date, end_date, granularity):
@@ -0,0 +1,171 @@
+// Client-side coalescing for the graph controls.
+//
+// Every control change lands in coalesceRequest, which only records the latest
+// "intent" (the full set of graph parameters). A debounce timer (with a max wait
+// so long drags still refresh) sends one sequenced request to the server via the
+// graph-request store. Identical intents are dropped, so the slider -> date picker
+// sync does not cause a second render. Responses carrying an old sequence number
+// are discarded in applyResponse.
+//
+// The counters are only displayed when the app adds the callback-stats div
+// (SHOW_CALLBACK_STATS=1). Requests and responses are counted as they happen and the
+// server reports its own update_graph count; the old-wiring figure is an estimate.
+
+const DEBOUNCE_MS = 200;
+const MAX_WAIT_MS = 600;
+
+const coalesceState = {
+    pending: null,
+    burstStart: null,
+    timer: null,
+    lastKey: null,
+    seq: 0,
+    // counters for the current burst of events (one user interaction)
+    burstEvents: 0,
+    burstOldEstimate: 0,
+    // session totals
+    events: 0,
+    oldEstimate: 0,
+    requests: 0,
+    responses: 0,
+    stale: 0,
+    serverRenders: null,
+    last: null,
+};
+
+function triggeredIds() {
+    const ctx = window.dash_clientside.callback_context;
+    return (ctx && ctx.triggered ? ctx.triggered : []).map(t => t.prop_id);
+}
+
+function toDateString(value) {
+    return value ? String(value).slice(0, 10) : null;
+}
+
+function showStats() {
+    if (!document.getElementById('callback-stats')) {
+        return;
+    }
+    const s = coalesceState;
+    const last = s.last
+        ? `Last interaction: ${s.last.events} control events → ${s.last.requests} graph request(s) ` +
+          `(old wiring, est.: ${s.last.oldEstimate} server callbacks). `
+        : '';
+    const server = s.serverRenders === null
+        ? ''
+        : ` This server process has run update_graph ${s.serverRenders} times.`;
+    window.dash_clientside.set_props('callback-stats', {
+        children: last +
+            `Session: ${s.events} events, ${s.requests} graph requests, ${s.responses} responses, ` +
+            `${s.stale} stale dropped (old wiring, est.: ${s.oldEstimate} server callbacks).` + server
+    });
+}
+
+function flush() {
+    const s = coalesceState;
+    const intent = s.pending;
+    clearTimeout(s.timer);
+    s.pending = null;
+    s.burstStart = null;
+    s.timer = null;
+    if (intent === null) {
+        return;
+    }
+
+    const key = JSON.stringify(intent);
+    const render = key !== s.lastKey;
+    s.last = {events: s.burstEvents, oldEstimate: s.burstOldEstimate, requests: render ? 1 : 0};
+    s.burstEvents = 0;
+    s.burstOldEstimate = 0;
+
+    if (render) {
+        s.lastKey = key;
+        s.seq += 1;
+        s.requests += 1;
+        window.dash_clientside.set_props('graph-request', {data: {...intent, seq: s.seq}});
+    }
+    showStats();
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    coalesce: {
+        syncDateRange: function (sliderRange, dates) {
+            if (!sliderRange || sliderRange.length !== 2) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            return [dates[sliderRange[0]], dates[sliderRange[1]]];
+        },
+
+        coalesceRequest: function (startDate, endDate, sliderRange, graphType, colorScale,
+                                   granularity, rollingValue, rollingDrag, dates) {
+            const s = coalesceState;
+            const ids = triggeredIds();
+
+            let start = toDateString(startDate);
+            let end = toDateString(endDate);
+            if (ids.includes('date-slider.value') && sliderRange && sliderRange.length === 2) {
+                start = dates[sliderRange[0]];
+                end = dates[sliderRange[1]];
+            }
+            let rollingWindow = rollingValue;
+            if (ids.includes('rolling-window.drag_value') && rollingDrag != null) {
+                rollingWindow = rollingDrag;
+            }
+
+            // Estimate of the server callbacks the old wiring made for the same event,
+            // taken from its callback graph rather than measured. A slider move (or reset)
+            // ran update_filters and then update_graph once, as the renderer holds
+            // update_graph until update_filters has written date-range. In drag mode every
+            // rolling-window step ran update_graph and the mouseup added nothing. Any other
+            // control ran update_graph once. syncDateRange likewise finishes before this
+            // callback runs, so a slider move arrives here as a single event.
+            let oldEstimate = 1;
+            if (ids.includes('date-slider.value')) {
+                oldEstimate = 2;
+            } else if (ids.length === 1 && ids[0] === 'rolling-window.value') {
+                oldEstimate = 0;
+            }
+            s.events += 1;
+            s.oldEstimate += oldEstimate;
+            s.burstEvents += 1;
+            s.burstOldEstimate += oldEstimate;
+
+            s.pending = {
+                start_date: start,
+                end_date: end,
+                graph_type: graphType,
+                color_scale: colorScale,
+                granularity: granularity,
+                rolling_window: rollingWindow,
+            };
+
+            const now = Date.now();
+            if (s.burstStart === null) {
+                s.burstStart = now;
+            }
+            clearTimeout(s.timer);
+            const delay = Math.max(0, Math.min(DEBOUNCE_MS, s.burstStart + MAX_WAIT_MS - now));
+            s.timer = setTimeout(flush, delay);
+
+            return window.dash_clientside.no_update;
+        },
+
+        applyResponse: function (response) {
+            const s = coalesceState;
+            if (!response) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            s.responses += 1;
+            if (response.server_renders !== undefined) {
+                s.serverRenders = response.server_renders;
+            }
+            if (response.seq !== s.seq) {
+                s.stale += 1;
+                showStats();
+                return window.dash_clientside.no_update;
+            }
+            showStats();
+            return response.figure;
+        },
+    },
+});
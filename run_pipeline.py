@@ -1,7 +1,9 @@
 import argparse
+import json
 import os
 from src.fetch_data import main as fetch_data_main
 from src.process_data import main as process_data_main
+from src.visualize import render_batch, DEFAULT_SPECS
 from app import app
 
 """
@@ -10,6 +12,9 @@ run_pipeline.py
 Usage:
   python run_pipeline.py --fetch        # Fetch latest data
   python run_pipeline.py --process      # Process fetched data
+  python run_pipeline.py --render       # Render static report charts (headless)
+  python run_pipeline.py --render --specs specs.json  # Render charts from a JSON list of specs
+  python run_pipeline.py --render --force  # Re-render every chart, even unchanged ones
   python run_pipeline.py --serve        # Run Dash app server (development)
   python run_pipeline.py --fetch --process --serve  # Run all steps sequentially
 """
@@ -24,6 +29,15 @@ def run_process():
     process_data_main()
 
 
+def run_render(specs_path=None, force=False):
+    print("Rendering report charts...")
+    specs = DEFAULT_SPECS
+    if specs_path:
+        with open(specs_path) as f:
+            specs = json.load(f)
+    render_batch(specs, force=force)
+
+
 def run_dash():
     print("Starting Dash app...")
     port = int(os.environ.get("PORT", 8050))
@@ -33,6 +47,9 @@ def main():
     parser = argparse.ArgumentParser(description="BTC Tracker pipeline commands")
     parser.add_argument('--fetch', action='store_true', help='Fetch latest data')
     parser.add_argument('--process', action='store_true', help='Process data for stats and smoothing')
+    parser.add_argument('--render', action='store_true', help='Render static report charts')
+    parser.add_argument('--specs', help='JSON file with a list of chart specs for --render')
+    parser.add_argument('--force', action='store_true', help='With --render, re-render charts even if unchanged')
     parser.add_argument('--serve', action='store_true', help='Run Dash app to serve plots')
 
 
@@ -44,12 +61,14 @@ def main():
         run_fetch()
     if args.process:
         run_process()
+    if args.render:
+        run_render(args.specs, force=args.force)
     if args.serve:
         run_dash()
 
 
     # Print if no arguments provided
-    if not (args.fetch or args.process or args.serve):
+    if not (args.fetch or args.process or args.render or args.serve):
         parser.print_help()
 
 
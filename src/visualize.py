@@ -1,38 +1,267 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # headless backend, safe on servers and in worker processes
+import matplotlib.dates as mdates
+from matplotlib.backend_bases import FigureCanvasBase
+import matplotlib.pyplot as plt
+import pandas as pd
 
 
-def visualize(data_path=None):
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_PATH = os.path.join(script_dir, '..', 'data', 'processed', 'bitcoin_dominance_processed.csv')
+DEFAULT_OUTPUT_DIR = os.path.join(script_dir, '..', 'data', 'reports')
+
+# Same resample rules as the Dash app's aggregate_data
+GRANULARITY_RULES = {
+    'day': 'D',
+    'week': 'W-MON',
+    'month': 'MS',
+    'year': 'YS',
+}
+
+INDEX_FILE = 'index.json'
+
+# Part of every chart fingerprint; bump it whenever render_chart's output changes
+# so previously rendered reports are redrawn on the next run
+RENDERER_VERSION = 2
+
+# Example nightly report; pass your own list of specs to render_batch
+DEFAULT_SPECS = [
+    {'name': 'dominance_daily', 'granularity': 'day'},
+    {'name': 'dominance_daily_30d_avg', 'granularity': 'day', 'rolling_window': 30},
+    {'name': 'dominance_weekly', 'granularity': 'week', 'rolling_window': 4},
+    {'name': 'dominance_monthly', 'granularity': 'month'},
+    {'name': 'dominance_by_year', 'granularity': 'month', 'breakdown': 'year'},
+    {'name': 'market_cap_by_asset', 'granularity': 'week', 'breakdown': 'asset'},
+]
+
+
+def load_dataset(data_path=None):
     if data_path is None:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        data_path = os.path.join(script_dir, '..', 'data', 'processed', 'bitcoin_dominance_processed.csv')
-    
+        data_path = DEFAULT_DATA_PATH
+
     print("Loading data from:", data_path)
-    
-    df = pd.read_csv(data_path)
-    
-    # Print columns for debugging
-    print("Columns found in CSV:", df.columns.tolist())
-    
-    # Converted the 'date' column to datetime
-    df['date'] = pd.to_datetime(df['date'])
-    
-    plt.figure(figsize=(10, 5))
-    plt.plot(df['date'], df['bitcoin_dominance'], marker='o', linestyle='-', color='orange')
-    plt.title('Bitcoin Dominance Over Time')
-    plt.xlabel('Date')
-    plt.ylabel('Bitcoin Dominance (%)')
-    plt.grid(True)
-    plt.tight_layout()
-    
-    # Save plot image
-    output_path = os.path.join(script_dir, '..', 'data', 'btc_dominance_plot.png')
-    plt.savefig(output_path)
-    plt.show()
-    
-    print(f"Chart displayed and saved as {output_path}")
+    df = pd.read_csv(data_path, parse_dates=['date'])
+    return df.sort_values('date').reset_index(drop=True)
+
+
+def normalize_spec(spec):
+    """Fill in defaults so equal charts always produce equal fingerprints."""
+    spec = dict(spec)
+    if 'name' not in spec:
+        raise ValueError(f"Chart spec is missing a 'name': {spec}")
+    granularity = spec.get('granularity', 'day')
+    if granularity not in GRANULARITY_RULES:
+        raise ValueError(f"Unknown granularity '{granularity}' in chart spec '{spec['name']}'")
+    breakdown = spec.get('breakdown')
+    if breakdown not in (None, 'year', 'asset'):
+        raise ValueError(f"Unknown breakdown '{breakdown}' in chart spec '{spec['name']}'")
+    if breakdown == 'year' and granularity == 'year':
+        raise ValueError(f"Chart spec '{spec['name']}' cannot break yearly data down by year")
+    formats = spec.get('formats', ['png', 'svg'])
+    if isinstance(formats, str):
+        formats = [formats]
+    supported = FigureCanvasBase.get_supported_filetypes()
+    for fmt in formats:
+        if fmt not in supported:
+            raise ValueError(f"Unsupported format '{fmt}' in chart spec '{spec['name']}'")
+
+    spec['granularity'] = granularity
+    spec['breakdown'] = breakdown
+    spec['rolling_window'] = int(spec.get('rolling_window', 1))
+    spec['start_date'] = str(spec['start_date']) if spec.get('start_date') else None
+    spec['end_date'] = str(spec['end_date']) if spec.get('end_date') else None
+    spec['formats'] = list(formats)
+    spec['title'] = spec.get('title') or spec['name'].replace('_', ' ').title()
+    return spec
+
+
+def prepare_chart_data(df, spec):
+    mask = pd.Series(True, index=df.index)
+    if spec['start_date']:
+        mask &= df['date'] >= pd.to_datetime(spec['start_date'])
+    if spec['end_date']:
+        mask &= df['date'] <= pd.to_datetime(spec['end_date'])
+
+    columns = ['date', 'bitcoin_dominance', 'bitcoin_market_cap', 'total_market_cap']
+    chart_df = df.loc[mask, columns].set_index('date')
+    chart_df = chart_df.resample(GRANULARITY_RULES[spec['granularity']]).mean().dropna().reset_index()
+    return chart_df
+
+
+def fingerprint(chart_df, spec):
+    digest = hashlib.sha256()
+    digest.update(f'renderer-{RENDERER_VERSION}'.encode())
+    digest.update(json.dumps(spec, sort_keys=True).encode())
+    digest.update(pd.util.hash_pandas_object(chart_df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _smooth(series, window):
+    if window > 1:
+        return series.rolling(window=window, min_periods=1).mean()
+    return series
+
+
+def render_chart(chart_df, spec, output_dir):
+    """Draw one chart and save it in every requested format. Runs inside a worker process."""
+    fig, ax = plt.subplots(figsize=(10, 5))
+    window = spec['rolling_window']
+    smoothing = f' ({window}-Period Rolling Avg)' if window > 1 else ''
+
+    if spec['breakdown'] == 'year':
+        # Overlay the years on one Jan-Dec axis by moving every date into the same (leap) year
+        years = chart_df['date'].dt.year
+        within_year = chart_df['date'].apply(lambda date: date.replace(year=2000))
+        # Smooth the whole series first so each year starts from the previous year's trend
+        dominance = _smooth(chart_df['bitcoin_dominance'], window)
+        cmap = plt.get_cmap('turbo', max(years.nunique(), 2))
+        for i, (year, year_df) in enumerate(chart_df.groupby(years)):
+            ax.plot(within_year[year_df.index], dominance[year_df.index], linestyle='-',
+                    color=cmap(i), label=str(year))
+        ax.xaxis.set_major_locator(mdates.MonthLocator())
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b'))
+        ax.set_ylabel('Bitcoin Dominance (%)')
+        ax.legend(ncol=2, fontsize='small', loc='upper left', bbox_to_anchor=(1.01, 1))
+    elif spec['breakdown'] == 'asset':
+        bitcoin_cap = _smooth(chart_df['bitcoin_market_cap'], window)
+        altcoin_cap = _smooth(chart_df['total_market_cap'] - chart_df['bitcoin_market_cap'], window)
+        ax.stackplot(
+            chart_df['date'], bitcoin_cap, altcoin_cap,
+            labels=['Bitcoin', 'Altcoins'], colors=['orange', 'steelblue'],
+        )
+        ax.set_ylabel('Market Cap (USD)')
+        ax.legend(loc='upper left')
+    else:
+        ax.plot(chart_df['date'], chart_df['bitcoin_dominance'], linestyle='-', color='orange', label='Dominance')
+        if window > 1:
+            rolling = _smooth(chart_df['bitcoin_dominance'], window)
+            ax.plot(chart_df['date'], rolling, linestyle='--', color='red', label=f'{window}-Period Rolling Avg')
+            ax.legend()
+        ax.set_ylabel('Bitcoin Dominance (%)')
+
+    ax.set_title(spec['title'] + (smoothing if spec['breakdown'] else ''))
+    ax.set_xlabel('Month' if spec['breakdown'] == 'year' else 'Date')
+    ax.grid(True)
+    fig.tight_layout()
+
+    files = []
+    try:
+        for fmt in spec['formats']:
+            file_name = f"{spec['name']}.{fmt}"
+            fig.savefig(os.path.join(output_dir, file_name), format=fmt)
+            files.append(file_name)
+    finally:
+        plt.close(fig)
+    return files
+
+
+def _load_index(output_dir):
+    index_path = os.path.join(output_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path) as f:
+        return {entry['name']: entry for entry in json.load(f)['charts']}
+
+
+def _write_index(output_dir, entries):
+    # Write to a temp file and swap it in so a crash never leaves a half-written index
+    index_path = os.path.join(output_dir, INDEX_FILE)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'charts': entries}, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def render_batch(specs, data_path=None, output_dir=None, max_workers=None, force=False):
+    """
+    Render a list of chart specs to PNG/SVG files plus an index.json.
+
+    The dataset is loaded once and each spec's slice is rendered in a process pool.
+    Specs whose data fingerprint matches the previous index (and whose files still
+    exist) are skipped unless force=True. A chart that fails to render is recorded
+    with an 'error' in the index and retried on the next run.
+    """
+    if output_dir is None:
+        output_dir = DEFAULT_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    df = load_dataset(data_path)
+    previous = _load_index(output_dir)
+
+    specs = [normalize_spec(spec) for spec in specs]
+    names = [spec['name'] for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Chart spec names must be unique")
+
+    entries = {}
+    jobs = []
+    failed = []
+    for spec in specs:
+        chart_df = prepare_chart_data(df, spec)
+        entry = {
+            'name': spec['name'],
+            'title': spec['title'],
+            'fingerprint': fingerprint(chart_df, spec),
+            'rows': len(chart_df),
+            'files': [f"{spec['name']}.{fmt}" for fmt in spec['formats']],
+        }
+        entries[spec['name']] = entry
+
+        old = previous.get(spec['name'])
+        up_to_date = (
+            old is not None
+            and 'error' not in old
+            and old['fingerprint'] == entry['fingerprint']
+            and all(os.path.exists(os.path.join(output_dir, name)) for name in entry['files'])
+        )
+        if up_to_date and not force:
+            print(f"Skipping {spec['name']} (unchanged)")
+            continue
+        if chart_df.empty:
+            print(f"Warning: no data for chart {spec['name']}, skipping")
+            entry['files'] = []
+            continue
+        jobs.append((chart_df, spec))
+
+    if jobs:
+        print(f"Rendering {len(jobs)} of {len(specs)} charts...")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(render_chart, chart_df, spec, output_dir) for chart_df, spec in jobs]
+            for (_, spec), future in zip(jobs, futures):
+                entry = entries[spec['name']]
+                try:
+                    entry['files'] = future.result()
+                except Exception as e:
+                    # Keep going so the charts that did render are still indexed
+                    print(f"Error rendering {spec['name']}: {e}")
+                    entry['files'] = []
+                    entry['error'] = f"{type(e).__name__}: {e}"
+                    failed.append(spec['name'])
+                else:
+                    print(f"Rendered {spec['name']}")
+
+    index_path = _write_index(output_dir, [entries[name] for name in names])
+    print(f"Report index saved to {index_path}")
+    if failed:
+        print(f"Warning: {len(failed)} chart(s) failed to render: {', '.join(failed)}")
+    return index_path
+
+
+def visualize(data_path=None):
+    output_dir = os.path.join(script_dir, '..', 'data')
+    spec = normalize_spec({'name': 'btc_dominance_plot', 'title': 'Bitcoin Dominance Over Time', 'formats': ['png']})
+
+    df = load_dataset(data_path)
+    files = render_chart(prepare_chart_data(df, spec), spec, output_dir)
+
+    print(f"Chart saved as {os.path.join(output_dir, files[0])}")
 
 
 if __name__ == "__main__":
-    visualize()
+    render_batch(DEFAULT_SPECS)